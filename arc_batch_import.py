@@ -1,6 +1,6 @@
 ﻿import arcpy
 import os
-import glob
+from functools import lru_cache
 
 # Configuration
 SOURCE_DIR = r"01_SOURCE"
@@ -8,38 +8,77 @@ TARGET_GDB = r"02_WORKING\Project_GDBs\KENSINGTON_MASTER.gdb"
 TARGET_DATASET = "MTM10_Production"
 TARGET_SR_CODE = 2952
 
+# Built once -- SpatialReference construction scans the projection database
+TARGET_SR = arcpy.SpatialReference(TARGET_SR_CODE)
+
+@lru_cache(maxsize=64)
+def _get_sr_from_prj(prj_text):
+    sr = arcpy.SpatialReference()
+    sr.loadFromString(prj_text)
+    return sr
+
+def get_source_sr(shp):
+    # Shapefiles sharing a .prj reuse one SpatialReference; fall back to
+    # Describe only when the sidecar file is missing
+    prj_path = os.path.splitext(shp)[0] + ".prj"
+    if os.path.exists(prj_path):
+        with open(prj_path) as f:
+            return _get_sr_from_prj(f.read())
+    return arcpy.Describe(shp).spatialReference
+
+def find_shps(root):
+    # Iterative scandir walk; yields lazily so imports can start before the
+    # scan of a large source tree finishes
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".shp"):
+                    yield entry.path
+
+def import_shapefile(shp, target_path):
+    try:
+        # Clean name for GDB (no spaces/hyphens)
+        base_name = os.path.splitext(os.path.basename(shp))[0]
+        clean_name = arcpy.ValidateTableName(base_name, TARGET_GDB)
+        output_path = os.path.join(target_path, clean_name)
+        
+        # Check source SR
+        source_sr = get_source_sr(shp)
+        
+        if source_sr.factoryCode == TARGET_SR_CODE:
+            arcpy.conversion.ExportFeatures(shp, output_path)
+            print(f"  [IMPORT] {clean_name} (Native MTM10)")
+        else:
+            arcpy.management.Project(shp, output_path, TARGET_SR)
+            print(f"  [PROJECT] {clean_name} (WGS84 -> MTM10)")
+        
+        print(f"    [OK] Imported to {TARGET_DATASET}")
+        return True
+        
+    except Exception as e:
+        print(f"    [FAILED] {shp}: {e}")
+        return False
+
 def batch_import_and_project():
     print(f"Starting Batch Import into {TARGET_GDB}...")
     arcpy.env.overwriteOutput = True
+    arcpy.SetLogHistory(False)  # Don't write geoprocessing history for every import
     
-    # 1. Target Spatial Reference
-    target_sr = arcpy.SpatialReference(TARGET_SR_CODE)
+    # 1. Target Dataset
     target_path = os.path.join(TARGET_GDB, TARGET_DATASET)
     
     # 2. Find all shapefiles in Source
-    shp_files = glob.glob(os.path.join(SOURCE_DIR, "**", "*.shp"), recursive=True)
+    shp_files = find_shps(SOURCE_DIR)
+    
+    # 3. Import one at a time -- arcpy is not thread-safe and adding a feature
+    # class takes an exclusive schema lock on the target feature dataset
+    failed = [shp for shp in shp_files if not import_shapefile(shp, target_path)]
     
-    for shp in shp_files:
-        try:
-            # Clean name for GDB (no spaces/hyphens)
-            base_name = os.path.splitext(os.path.basename(shp))[0]
-            clean_name = arcpy.ValidateTableName(base_name, TARGET_GDB)
-            output_path = os.path.join(target_path, clean_name)
-            
-            # Check source SR
-            source_sr = arcpy.Describe(shp).spatialReference
-            
-            if source_sr.factoryCode == TARGET_SR_CODE:
-                print(f"  [IMPORT] {clean_name} (Native MTM10)")
-                arcpy.management.CopyFeatures(shp, output_path)
-            else:
-                print(f"  [PROJECT] {clean_name} (WGS84 -> MTM10)")
-                arcpy.management.Project(shp, output_path, target_sr)
-            
-            print(f"    [OK] Imported to {TARGET_DATASET}")
-            
-        except Exception as e:
-            print(f"    [FAILED] {shp}: {e}")
+    if failed:
+        print(f"Finished with {len(failed)} failed import(s).")
 
 if __name__ == "__main__":
     batch_import_and_project()
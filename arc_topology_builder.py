@@ -6,9 +6,17 @@ GDB_PATH = r"02_WORKING\Project_GDBs\KENSINGTON_MASTER.gdb"
 DATASET_NAME = "MTM10_Production"
 TOPOLOGY_NAME = "Kensington_Topology"
 
+# (feature class, label, rule) -- classes missing from the dataset are skipped
+TOPOLOGY_MEMBERS = [
+    ("buildings", "Buildings", "Must Not Overlap (Area)"),
+    ("roads", "Roads", "Must Not Have Dangles (Line)"),
+]
+
 def build_topology():
     print(f"Building Topology: {TOPOLOGY_NAME}...")
     arcpy.env.overwriteOutput = True
+    arcpy.env.maintainAttachments = False
+    arcpy.SetLogHistory(False)
     
     dataset_path = os.path.join(GDB_PATH, DATASET_NAME)
     topo_path = os.path.join(dataset_path, TOPOLOGY_NAME)
@@ -20,25 +28,28 @@ def build_topology():
     else:
         print(f"  [INFO] {TOPOLOGY_NAME} already exists.")
 
-    # 2. Add Feature Classes to Topology (Example: Buildings)
-    # Check if 'buildings' exists (after running batch_import)
+    # 2. Add Feature Classes and Rules to Topology
+    # Only classes that exist (after running batch_import) are added.
+    # All classes are added first, then all rules, and the topology is
+    # validated once at the end rather than after each change.
     try:
-        buildings = os.path.join(dataset_path, "buildings")
-        roads = os.path.join(dataset_path, "roads")
+        members = [
+            (os.path.join(dataset_path, name), label, rule)
+            for name, label, rule in TOPOLOGY_MEMBERS
+            if arcpy.Exists(os.path.join(dataset_path, name))
+        ]
         
-        if arcpy.Exists(buildings):
-            print("  [OK] Adding Buildings to Topology...")
-            arcpy.management.AddFeatureClassToTopology(topo_path, buildings, 1, 1)
-            # Rule: Buildings Must Not Overlap
-            arcpy.management.AddRuleToTopology(topo_path, "Must Not Overlap (Area)", buildings)
-            print("    [RULE] Added: Must Not Overlap (Buildings)")
-            
-        if arcpy.Exists(roads):
-            print("  [OK] Adding Roads to Topology...")
-            arcpy.management.AddFeatureClassToTopology(topo_path, roads, 1, 1)
-            # Rule: Roads Must Not Have Dangles
-            arcpy.management.AddRuleToTopology(topo_path, "Must Not Have Dangles (Line)", roads)
-            print("    [RULE] Added: Must Not Have Dangles (Roads)")
+        for fc, label, _ in members:
+            print(f"  [OK] Adding {label} to Topology...")
+            arcpy.management.AddFeatureClassToTopology(topo_path, fc, 1, 1)
+        
+        for fc, label, rule in members:
+            arcpy.management.AddRuleToTopology(topo_path, rule, fc)
+            print(f"    [RULE] Added: {rule.rsplit(' (', 1)[0]} ({label})")
+        
+        if members:
+            arcpy.management.ValidateTopology(topo_path)
+            print("  [OK] Validated Topology.")
             
     except Exception as e:
         print(f"  [FAILED] {e}")
@@ -0,0 +1,38 @@
+"""Stamp-file output cache shared by the map and guide build scripts.
+
+A script skips regeneration when the digest of its inputs matches the one
+stored in <output>.stamp by the last successful run.
+"""
+import hashlib
+import os
+
+CACHE_VERSION = "1"
+
+
+def inputs_digest(paths):
+    # blake2b over each input's (mtime, size); the script itself is usually one
+    # of the paths so edits to it invalidate the cache too
+    h = hashlib.blake2b(CACHE_VERSION.encode(), digest_size=16)
+    try:
+        for path in paths:
+            st = os.stat(path)
+            h.update(f"{path}|{st.st_mtime_ns}|{st.st_size}\n".encode())
+    except OSError:
+        return None  # Missing input: always rebuild
+    return h.hexdigest()
+
+
+def is_up_to_date(output_path, digest):
+    if digest is None or not os.path.exists(output_path):
+        return False
+    try:
+        with open(output_path + ".stamp") as f:
+            return f.read() == digest
+    except OSError:
+        return False
+
+
+def write_stamp(output_path, digest):
+    if digest is not None:
+        with open(output_path + ".stamp", "w") as f:
+            f.write(digest)
@@ -1,6 +1,10 @@
 import folium
+from folium.plugins import VectorGridProtobuf
 import geopandas as gpd
 import os
+import subprocess
+import sys
+from build_stamp import inputs_digest, is_up_to_date, write_stamp
 
 # Configuration — update data_base_dir if source GeoJSON files are stored elsewhere
 data_base_dir = r"01_SOURCE"
@@ -11,47 +15,99 @@ os.makedirs(script_output_dir, exist_ok=True)
 leisure_geojson_path = os.path.join(data_base_dir, 'leisure.geojson')
 reseaucyclable_geojson_path = os.path.join(data_base_dir, 'reseaucyclable.geojson')
 
+output_html_path = os.path.join(script_output_dir, 'kensington_map.html')
+
 kensington_market_coords = (43.655, -79.400)
 
+# Vector tiles: pre-slice the leisure layer into a {z}/{x}/{y}.pbf pyramid with
+# tippecanoe so the browser only loads visible tiles. Requires tippecanoe on
+# PATH, and the output folder must be served over HTTP (e.g.
+# `python -m http.server` from script_output_dir) -- tiles do not load via file://.
+USE_VECTOR_TILES = False
+leisure_tiles_dir = os.path.join(script_output_dir, 'tiles', 'leisure')
+
+# Simplification tolerances in degrees (source GeoJSON is EPSG:4326).
+# ~1 m for polygons and ~0.5 m for lines is invisible at zoom 15 (~5 m/pixel)
+# but drops most vertices from the HTML payload.
+POLYGON_SIMPLIFY_TOLERANCE = 0.00001
+LINE_SIMPLIFY_TOLERANCE = 0.000005
+
+# Constant layer styles -- built once and returned as-is for every feature
+LEISURE_STYLE = {
+    'fillColor': '#80FF80',
+    'color': 'black',
+    'weight': 1,
+    'fillOpacity': 0.7
+}
+BICYCLE_NETWORK_STYLE = {
+    'color': 'blue',
+    'weight': 3,
+    'opacity': 0.7
+}
+
+
+def build_vector_tiles(geojson_path, tiles_dir, layer_name):
+    subprocess.run(
+        ['tippecanoe', '-e', tiles_dir, '-l', layer_name, '-zg',
+         '--drop-densest-as-needed', '--no-tile-compression', '--force', geojson_path],
+        check=True,
+    )
+
+
+# Skip regeneration when the inputs (and this script) are unchanged since the last run
+digest = inputs_digest([__file__, leisure_geojson_path, reseaucyclable_geojson_path])
+if is_up_to_date(output_html_path, digest):
+    print(f"Map up to date (inputs unchanged): {output_html_path}")
+    sys.exit(0)
+
+all_layers_added = True
+
 m = folium.Map(location=kensington_market_coords, zoom_start=15)
 
 try:
-    leisure_gdf = gpd.read_file(leisure_geojson_path)
-    folium.GeoJson(
-        leisure_gdf,
-        name='Leisure Areas',
-        tooltip=folium.GeoJsonTooltip(fields=['name', 'leisure']),
-        style_function=lambda x: {
-            'fillColor': '#80FF80',
-            'color': 'black',
-            'weight': 1,
-            'fillOpacity': 0.7
-        }
-    ).add_to(m)
+    if USE_VECTOR_TILES:
+        build_vector_tiles(leisure_geojson_path, leisure_tiles_dir, 'leisure')
+        VectorGridProtobuf(
+            'tiles/leisure/{z}/{x}/{y}.pbf',
+            'Leisure Areas',
+            {'vectorTileLayerStyles': {'leisure': dict(LEISURE_STYLE, fill=True)}},
+        ).add_to(m)
+    else:
+        leisure_gdf = gpd.read_file(leisure_geojson_path, engine='pyogrio', use_arrow=True,
+                                    columns=['name', 'leisure'])
+        leisure_gdf['geometry'] = leisure_gdf.geometry.simplify(POLYGON_SIMPLIFY_TOLERANCE, preserve_topology=True)
+        folium.GeoJson(
+            leisure_gdf,
+            name='Leisure Areas',
+            tooltip=folium.GeoJsonTooltip(fields=['name', 'leisure']),
+            style_function=lambda _: LEISURE_STYLE
+        ).add_to(m)
     print(f"Added {leisure_geojson_path} to the map.")
 except Exception as e:
     print(f"Could not load or add {leisure_geojson_path}: {e}")
+    all_layers_added = False
 
 try:
-    reseaucyclable_gdf = gpd.read_file(reseaucyclable_geojson_path)
+    reseaucyclable_gdf = gpd.read_file(reseaucyclable_geojson_path, engine='pyogrio', use_arrow=True,
+                                       columns=['name', 'type'])
+    reseaucyclable_gdf['geometry'] = reseaucyclable_gdf.geometry.simplify(LINE_SIMPLIFY_TOLERANCE, preserve_topology=True)
     folium.GeoJson(
         reseaucyclable_gdf,
         name='Bicycle Network',
         tooltip=folium.GeoJsonTooltip(fields=['name', 'type']),
-        style_function=lambda x: {
-            'color': 'blue',
-            'weight': 3,
-            'opacity': 0.7
-        }
+        style_function=lambda _: BICYCLE_NETWORK_STYLE
     ).add_to(m)
     print(f"Added {reseaucyclable_geojson_path} to the map.")
 except Exception as e:
     print(f"Could not load or add {reseaucyclable_geojson_path}: {e}")
+    all_layers_added = False
 
 folium.LayerControl().add_to(m)
 
-output_html_path = os.path.join(script_output_dir, 'kensington_map.html')
 m.save(output_html_path)
+# Only cache a complete map, so a failed layer is retried on the next run
+if all_layers_added:
+    write_stamp(output_html_path, digest)
 
 print(f"Interactive map saved to {output_html_path}")
 print(f"To view the map, open '{output_html_path}' in your web browser.")
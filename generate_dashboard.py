@@ -1,7 +1,10 @@
 ﻿import sqlite3
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; skips GUI backend auto-detection
 import matplotlib.pyplot as plt
 import io
+from itertools import groupby
+from operator import itemgetter
 import base64
 import os
 
@@ -9,86 +12,140 @@ import os
 DB_PATH = r"02_WORKING\04_SQL_DATABASE\KENSINGTON_PROD.sqlite"
 OUTPUT_HTML = r"02_WORKING\05_ANALYSIS_OUTPUTS\Kensington_Report.html"
 
+# One UNION ALL branch per chart; the first column tags each row's chart.
+# Only branches whose source view exists are combined, so a view skipped by
+# create_analytical_views.py empties its own chart and not the other one.
+# Each branch sorts before its LIMIT: the materialised tables have no row order
+CHART_QUERIES = {
+    'bike': ("v_bicycle_parking_by_street",
+             "SELECT * FROM (SELECT 'bike', Street_Address, Total_Spots FROM v_bicycle_parking_by_street ORDER BY Total_Spots DESC, Street_Address LIMIT 10)"),
+    'permit': ("v_permit_status_summary",
+               "SELECT * FROM (SELECT 'permit', Permit_Type, Count FROM v_permit_status_summary ORDER BY Count DESC, Permit_Type LIMIT 5)"),
+}
+
+CHART_DPI = 80  # Screen resolution is enough for an HTML report; fewer pixels to encode
+
+# Read-only tuning: large page cache, in-memory temp storage, memory-mapped
+# reads, and query_only so the report can never modify the database
+SQLITE_PRAGMAS = """
+    PRAGMA cache_size=-262144;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA query_only=1;
+"""
+
+# Report page; __BIKE_CHART__ / __PERMIT_CHART__ are replaced with base64 PNGs
+REPORT_TEMPLATE = b"""
+    <html>
+    <head>
+        <title>Kensington GIS Intelligence Report</title>
+        <style>
+            body { font-family: Arial, sans-serif; margin: 40px; background-color: #f4f4f4; }
+            .container { max-width: 800px; margin: auto; background: white; padding: 20px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }
+            h1 { text-align: center; color: #333; }
+            h2 { color: #555; border-bottom: 2px solid #ddd; padding-bottom: 10px; }
+            .chart { text-align: center; margin-bottom: 40px; }
+            img { max-width: 100%; height: auto; }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>Kensington Market Intelligence Report</h1>
+            <p>Generated automatically from <strong>KENSINGTON_PROD.sqlite</strong>.</p>
+            
+            <h2>Bicycle Infrastructure Analysis</h2>
+            <div class="chart">
+                <img src="data:image/png;base64,__BIKE_CHART__" alt="Bicycle Parking Chart">
+                <p>Top streets by bicycle parking capacity.</p>
+            </div>
+
+            <h2>Urban Development Analysis</h2>
+            <div class="chart">
+                <img src="data:image/png;base64,__PERMIT_CHART__" alt="Permit Distribution Chart">
+                <p>Breakdown of active building permit types.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
 def generate_report():
     print(f"Generating Business Intelligence Report: {OUTPUT_HTML}...")
     os.makedirs(os.path.dirname(OUTPUT_HTML), exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
+    conn.executescript(SQLITE_PRAGMAS)
+    
+    # --- Fetch Chart Data ---
+    chart_data = {kind: [] for kind in CHART_QUERIES}
+    existing = {name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+    branches = []
+    for kind, (view, sql) in CHART_QUERIES.items():
+        if view in existing:
+            branches.append(sql)
+        else:
+            print(f"  [WARN] {view} not found; {kind} chart will be empty")
+    if branches:
+        try:
+            rows = conn.execute("\nUNION ALL\n".join(branches)).fetchall()
+            for kind, group in groupby(rows, key=itemgetter(0)):
+                chart_data[kind] = [row[1:] for row in group]
+        except Exception as e:
+            print(f"  [WARN] Could not query chart data: {e}")
+    
+    # A single figure is reused (cleared and resized) for both charts
+    fig = plt.figure(figsize=(10, 6))
     
     # --- Generate Chart: Bicycle Parking ---
     try:
-        df_bikes = pd.read_sql_query("SELECT * FROM v_bicycle_parking_by_street LIMIT 10", conn)
+        if not chart_data['bike']:
+            raise ValueError("no rows returned")
+        addresses, spots = zip(*chart_data['bike'])
         
-        plt.figure(figsize=(10, 6))
-        plt.bar(df_bikes['Street_Address'], df_bikes['Total_Spots'], color='#1f77b4')
+        plt.bar(addresses, spots, color='#1f77b4')
         plt.title('Top 10 Streets for Bicycle Parking')
         plt.xticks(rotation=45, ha='right')
         plt.tight_layout()
         
         # Save to Base64 String
         buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        bike_chart_b64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-        plt.close()
+        fig.savefig(buf, format='png', dpi=CHART_DPI)
+        bike_chart_b64 = base64.b64encode(buf.getvalue())
     except Exception as e:
         print(f"  [WARN] Could not generate bike chart: {e}")
-        bike_chart_b64 = ""
+        bike_chart_b64 = b""
 
     # --- Generate Chart: Permits ---
     try:
-        df_permits = pd.read_sql_query("SELECT * FROM v_permit_status_summary LIMIT 5", conn)
+        if not chart_data['permit']:
+            raise ValueError("no rows returned")
+        permit_types, counts = zip(*chart_data['permit'])
         
-        plt.figure(figsize=(8, 8))
-        plt.pie(df_permits['Count'], labels=df_permits['Permit_Type'], autopct='%1.1f%%', startangle=140)
+        fig.clf()
+        fig.set_size_inches(8, 8)
+        plt.pie(counts, labels=permit_types, autopct='%1.1f%%', startangle=140)
         plt.title('Building Permit Distribution')
         plt.axis('equal')
         
         # Save to Base64 String
         buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        permit_chart_b64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-        plt.close()
+        fig.savefig(buf, format='png', dpi=CHART_DPI)
+        permit_chart_b64 = base64.b64encode(buf.getvalue())
     except Exception as e:
         print(f"  [WARN] Could not generate permit chart: {e}")
-        permit_chart_b64 = ""
+        permit_chart_b64 = b""
+    plt.close(fig)
 
     # --- Generate HTML ---
-    html_content = f"""
-    <html>
-    <head>
-        <title>Kensington GIS Intelligence Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; background-color: #f4f4f4; }}
-            .container {{ max-width: 800px; margin: auto; background: white; padding: 20px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
-            h1 {{ text-align: center; color: #333; }}
-            h2 {{ color: #555; border-bottom: 2px solid #ddd; padding-bottom: 10px; }}
-            .chart {{ text-align: center; margin-bottom: 40px; }}
-            img {{ max-width: 100%; height: auto; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Kensington Market Intelligence Report</h1>
-            <p>Generated automatically from <strong>KENSINGTON_PROD.sqlite</strong>.</p>
-            
-            <h2>Bicycle Infrastructure Analysis</h2>
-            <div class="chart">
-                <img src="data:image/png;base64,{bike_chart_b64}" alt="Bicycle Parking Chart">
-                <p>Top streets by bicycle parking capacity.</p>
-            </div>
-
-            <h2>Urban Development Analysis</h2>
-            <div class="chart">
-                <img src="data:image/png;base64,{permit_chart_b64}" alt="Permit Distribution Chart">
-                <p>Breakdown of active building permit types.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    # base64 output is ASCII bytes already, so it is spliced into the bytes
+    # template and written in binary mode without a text-encode pass
+    html_content = (
+        REPORT_TEMPLATE
+        .replace(b'__BIKE_CHART__', bike_chart_b64)
+        .replace(b'__PERMIT_CHART__', permit_chart_b64)
+    )
     
-    with open(OUTPUT_HTML, "w", encoding='utf-8') as f:
+    with open(OUTPUT_HTML, "wb", buffering=1 << 20) as f:
         f.write(html_content)
         
     conn.close()
@@ -1,22 +1,49 @@
 ﻿import geopandas as gpd
+import numpy as np
 import folium
+from folium.plugins import FastMarkerCluster
 import os
+from build_stamp import inputs_digest, is_up_to_date, write_stamp
 
 # Configuration
 WORKING_DIR = r"02_WORKING\01_MTM10_STAGED_SHP"
 OUTPUT_DIR = r"02_WORKING\03_MAP_OUTPUTS"
 TARGET_CRS = "EPSG:4326"  # Required for Folium (Leaflet)
 
+# Builds each clustered marker client-side from a [lat, lon, address, status] row
+BIKE_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+        {radius: 5, color: 'green', fill: true, fillColor: 'green'});
+    marker.bindTooltip('Address: ' + row[2] + '<br>Status: ' + row[3]);
+    return marker;
+}
+"""
+
 # Ensure output directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 def generate_webmap():
     print("Generating Interactive Web Map...")
     
+    bike_path = os.path.join(WORKING_DIR, "Bicycle Parking Map Data - 2952", "Bicycle Parking Map Data - 2952.shp")
+    bike_stem = os.path.splitext(bike_path)[0]
+    output_file = os.path.join(OUTPUT_DIR, "kensington_interactive_bikes.html")
+    # Skip regeneration when the inputs (and this script) are unchanged since the last run
+    digest = inputs_digest([__file__] + [bike_stem + ext for ext in (".shp", ".dbf", ".prj")])
+    if is_up_to_date(output_file, digest):
+        print(f"Map up to date (inputs unchanged): {output_file}")
+        return
+    
     try:
         # 1. Load Data (Bicycle Parking)
-        bike_path = os.path.join(WORKING_DIR, "Bicycle Parking Map Data - 2952", "Bicycle Parking Map Data - 2952.shp")
-        gdf_bike = gpd.read_file(bike_path)
+        # Only the tooltip fields are read, so no other attributes reach the HTML
+        gdf_bike = gpd.read_file(bike_path, engine='pyogrio', use_arrow=True,
+                                 columns=['ADDRESS_FU', 'STATUS'])
+        
+        # Drop null/empty geometries -- their x/y are NaN, which the marker
+        # cluster rejects (the GeoJson layer used to skip them silently)
+        gdf_bike = gdf_bike[~(gdf_bike.geometry.isna() | gdf_bike.geometry.is_empty)]
         
         # 2. Reproject to WGS84 (Lat/Lon)
         gdf_bike_web = gdf_bike.to_crs(TARGET_CRS)
@@ -29,19 +56,25 @@ def generate_webmap():
         m = folium.Map(location=[center_lat, center_lon], zoom_start=15, tiles="CartoDB positron")
         
         # 4. Add Features
-        folium.GeoJson(
-            gdf_bike_web,
-            name="Bicycle Parking",
-            tooltip=folium.GeoJsonTooltip(fields=['ADDRESS_FU', 'STATUS'], aliases=['Address:', 'Status:']),
-            marker=folium.CircleMarker(radius=5, color='green', fill=True, fill_color='green')
-        ).add_to(m)
+        # Clustered markers keep the DOM small for large point sets; rows are
+        # plain lists so the points are never serialised as a GeoJSON layer
+        # Coordinates come straight from the GEOS coordinate buffers as arrays
+        coords = np.column_stack([
+            gdf_bike_web.geometry.y.to_numpy(),
+            gdf_bike_web.geometry.x.to_numpy(),
+        ]).tolist()
+        # Null attributes would reach the tooltip as NaN
+        addresses = gdf_bike_web['ADDRESS_FU'].fillna('').to_list()
+        statuses = gdf_bike_web['STATUS'].fillna('').to_list()
+        bike_rows = [c + [a, s] for c, a, s in zip(coords, addresses, statuses)]
+        FastMarkerCluster(bike_rows, callback=BIKE_MARKER_CALLBACK, name="Bicycle Parking").add_to(m)
         
         # 5. Add Controls
         folium.LayerControl().add_to(m)
         
         # 6. Save HTML
-        output_file = os.path.join(OUTPUT_DIR, "kensington_interactive_bikes.html")
         m.save(output_file)
+        write_stamp(output_file, digest)
         print(f"Map saved to: {output_file}")
         
     except Exception as e:
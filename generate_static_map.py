@@ -1,11 +1,18 @@
 ﻿import geopandas as gpd
 import matplotlib.pyplot as plt
 import os
+from shapely.geometry import box
 
 # Configuration
 WORKING_DIR = r"02_WORKING\01_MTM10_STAGED_SHP"
 OUTPUT_DIR = r"02_WORKING\03_MAP_OUTPUTS"
 
+# Kensington Market map extent in MTM10 metres (x_min, y_min, x_max, y_max),
+# roughly Bathurst to Spadina and Queen to College with a small margin
+BBOX = (312000, 4834200, 313500, 4835600)
+SIMPLIFY_TOLERANCE = 0.5  # metres; well below one pixel at this extent
+OUTPUT_DPI = 120  # Screen/web resolution; rasterising and encoding scale with pixel count
+
 # Ensure output directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -19,24 +26,36 @@ def generate_map():
         roads_path = os.path.join(WORKING_DIR, "Edge_of_Roadway_EPSG2952", "Edge of Roadway - 2952.shp")
         sidewalks_path = os.path.join(WORKING_DIR, "Sidewalks_EPSG2952", "Sidewalks - 2952.shp")
         
-        gdf_roads = gpd.read_file(roads_path)
-        gdf_sidewalks = gpd.read_file(sidewalks_path)
+        # pyogrio's Arrow reader; columns=[] skips attributes since only geometry is plotted
+        gdf_roads = gpd.read_file(roads_path, engine='pyogrio', use_arrow=True, columns=[])
+        gdf_sidewalks = gpd.read_file(sidewalks_path, engine='pyogrio', use_arrow=True, columns=[])
+        
+        # 2. Clip to the map extent (spatial-index prefilter, then cut edges
+        # that cross it) and drop sub-pixel vertices so matplotlib only
+        # rasterises what is visible
+        extent = box(*BBOX)
+        gdf_roads = gpd.clip(gdf_roads, extent)
+        gdf_sidewalks = gpd.clip(gdf_sidewalks, extent)
+        gdf_roads = gdf_roads.set_geometry(gdf_roads.geometry.simplify(SIMPLIFY_TOLERANCE))
+        gdf_sidewalks = gdf_sidewalks.set_geometry(gdf_sidewalks.geometry.simplify(SIMPLIFY_TOLERANCE))
         
-        # 2. Setup Plot
+        # 3. Setup Plot
         fig, ax = plt.subplots(figsize=(12, 12))
         
-        # 3. Plot Layers
+        # 4. Plot Layers
         gdf_roads.plot(ax=ax, color='gray', linewidth=0.5, label='Road Edges')
         gdf_sidewalks.plot(ax=ax, color='orange', alpha=0.6, label='Sidewalks')
         
-        # 4. Styling
+        # 5. Styling
         ax.set_title("Kensington Market Infrastructure (MTM Zone 10)", fontsize=16)
         ax.set_axis_off()
         plt.legend()
         
-        # 5. Save Output
+        # 6. Save Output
         output_file = os.path.join(OUTPUT_DIR, "kensington_static_infrastructure.png")
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        # Fast deflate: slightly larger PNG for much less encoding time
+        plt.savefig(output_file, dpi=OUTPUT_DPI, bbox_inches='tight',
+                    pil_kwargs={'optimize': False, 'compress_level': 1})
         plt.close(fig)
         print(f"Map saved to: {output_file}")
         
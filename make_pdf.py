@@ -6,131 +6,260 @@ Usage:
     pip install fpdf2
     python make_pdf.py
     -> GIS_Script_Generator_User_Guide.pdf
+
+    # Render chapters in N worker processes and merge them (needs pypdf)
+    pip install pypdf
+    python make_pdf.py --jobs 4
+
+    # Draft build of selected chapters only (cover + chapters 5 and 12-14)
+    python make_pdf.py --chapters 5,12-14
+    -> GIS_Script_Generator_User_Guide_draft.pdf
+
+    # Repack the finished file into compressed object streams (needs pikepdf)
+    pip install pikepdf
+    python make_pdf.py --object-streams
+
+A rerun with the same script, date, fpdf2 version and options leaves the
+existing PDF alone (see <output>.stamp); pass --force to rebuild anyway.
+Use -o/--output to write somewhere else.
 """
 
-from fpdf import FPDF
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
+from functools import lru_cache
+from importlib import metadata
+from itertools import cycle
+from typing import TYPE_CHECKING
+
+from build_stamp import CACHE_VERSION, is_up_to_date, write_stamp
+
+if TYPE_CHECKING:
+    from fpdf import FPDF
 
 OUTPUT = "GIS_Script_Generator_User_Guide.pdf"
+DRAFT_OUTPUT = "GIS_Script_Generator_User_Guide_draft.pdf"  # --chapters builds; never the tracked guide
+_TODAY = date.today().isoformat()
 
 # ---------------------------------------------------------------------------
 # Replace characters outside cp1252 so built-in fonts don't choke
 # ---------------------------------------------------------------------------
 
+_CP1252_TRANS = str.maketrans({
+    "\u2192": "->",
+    "\u2014": "--",
+    "\u2013": "-",
+    "\u2018": "'", "\u2019": "'",
+    "\u201c": '"', "\u201d": '"',
+    "\u2022": "-",
+    "\u00b0": "deg",
+    "\u00ab": "<<", "\u00bb": ">>",
+})
+
+
+@lru_cache(maxsize=4096)
 def s(text: str) -> str:
     """Sanitise to cp1252-safe characters."""
-    return (
-        text
-        .replace("\u2192", "->")
-        .replace("\u2014", "--")
-        .replace("\u2013", "-")
-        .replace("\u2018", "'").replace("\u2019", "'")
-        .replace("\u201c", '"').replace("\u201d", '"')
-        .replace("\u2022", "-")
-        .replace("\u00b0", "deg")
-        .replace("\u00ab", "<<").replace("\u00bb", ">>")
-    )
+    if text.isascii():
+        return text
+    return text.translate(_CP1252_TRANS)
+
+
+# Fixed strings repeated on every page / note, sanitised once at import
+_HEADER_TITLE = s("GIS Script Generator -- User Guide")
+_FOOTER_TEXT = s(f"Generated {_TODAY}  |  gis-codegen v0.1.0")
+_NOTE_PREFIX = s("  NOTE:  ")
 
 
 # ---------------------------------------------------------------------------
-# PDF class
+# PDF class (fpdf2 is imported lazily, see guide_pdf_class)
 # ---------------------------------------------------------------------------
 
-class GuidePDF(FPDF):
+class GuideLayout:
+    """Page furniture and layout helpers, mixed into FPDF by guide_pdf_class()."""
+
     M = 20          # left/right margin
     CW = 170        # usable column width on A4 (210 - 2*20)
+    RIGHT_X = 190   # right edge of the column (210 - M)
+    SANS = "Helvetica"  # body/heading family; core font, so text goes through s()
+    MONO = "Courier"    # code blocks
+
+    def __init__(self, *args, has_cover=True, number_pages=True, **kwargs):
+        # Chapters rendered as separate documents (--jobs) have no cover, and
+        # leave the page number blank so it can be stamped after merging
+        super().__init__(*args, **kwargs)
+        self._header_enabled = not has_cover   # off for the cover page only
+        self.number_pages = number_pages
+
+    # ---- page furniture ----------------------------------------------
 
     def header(self):
-        if self.page_no() == 1:
+        if not self._header_enabled:
+            self._header_enabled = True
             return
-        self.set_font("Helvetica", "I", 8)
+        self.set_font(self.SANS, "I", 8)
         self.set_text_color(130, 130, 130)
-        self.cell(self.CW // 2, 7, s("GIS Script Generator -- User Guide"), ln=0, align="L")
-        self.cell(self.CW // 2, 7, f"Page {self.page_no()}", ln=1, align="R")
-        self.set_text_color(0, 0, 0)
+        self.cell(self.CW // 2, 7, _HEADER_TITLE, ln=0, align="L")
+        self.cell(self.CW // 2, 7, f"Page {self.page_no()}" if self.number_pages else "",
+                  ln=1, align="R")
         self.set_draw_color(180, 180, 180)
-        self.line(self.M, self.get_y(), 210 - self.M, self.get_y())
+        y = self.get_y()
+        self.line(self.M, y, self.RIGHT_X, y)
         self.ln(2)
 
     def footer(self):
         self.set_y(-13)
-        self.set_font("Helvetica", "I", 8)
+        self.set_font(self.SANS, "I", 8)
         self.set_text_color(130, 130, 130)
-        self.cell(0, 6, s(f"Generated {date.today()}  |  gis-codegen v0.1.0"), align="C")
-        self.set_text_color(0, 0, 0)
+        self.cell(0, 6, _FOOTER_TEXT, align="C")
 
     # ---- layout helpers ------------------------------------------------
+    # Each helper selects every colour it draws with instead of restoring
+    # black on the way out; fpdf2 ignores a set_font/set_*_color call that
+    # matches the current state, so the repeat requests cost nothing.
 
     def chapter(self, num, title):
         self.add_page()
         self.set_fill_color(30, 80, 160)
         self.set_text_color(255, 255, 255)
-        self.set_font("Helvetica", "B", 14)
+        self.set_font(self.SANS, "B", 14)
         self.cell(0, 10, s(f"  {num}.  {title}"), ln=1, fill=True)
-        self.set_text_color(0, 0, 0)
         self.ln(4)
 
     def section(self, title):
         self.ln(3)
-        self.set_font("Helvetica", "B", 11)
+        self.set_font(self.SANS, "B", 11)
         self.set_text_color(30, 80, 160)
-        self.cell(0, 7, s(title), ln=1)
-        self.set_text_color(0, 0, 0)
         self.set_draw_color(30, 80, 160)
-        self.line(self.M, self.get_y(), 210 - self.M, self.get_y())
-        self.set_draw_color(0, 0, 0)
+        self.cell(0, 7, s(title), ln=1, border="B")    # rule under the title
         self.ln(2)
 
     def body(self, text):
-        self.set_font("Helvetica", "", 10)
+        self.set_font(self.SANS, "", 10)
+        self.set_text_color(0, 0, 0)
         self.multi_cell(0, 5, s(text))
         self.ln(1)
 
     def bullets(self, items):
-        self.set_font("Helvetica", "", 10)
+        self.set_font(self.SANS, "", 10)
+        self.set_text_color(0, 0, 0)
+        indent, wrap = self.M + 4, self.CW - 9
         for item in items:
-            x = self.get_x()
-            self.set_x(self.M + 4)
-            self.cell(5, 5, s("-"))
-            self.multi_cell(self.CW - 9, 5, s(item))
+            self.set_x(indent)
+            self.cell(5, 5, "-")
+            self.multi_cell(wrap, 5, s(item))
         self.ln(1)
 
     def code(self, text, caption=""):
         if caption:
-            self.set_font("Helvetica", "BI", 8)
+            self.set_font(self.SANS, "BI", 8)
             self.set_text_color(80, 80, 80)
             self.cell(0, 5, s(caption), ln=1)
-            self.set_text_color(0, 0, 0)
-        self.set_font("Courier", "", 7.5)
+        self.set_font(self.MONO, "", 7.5)
+        self.set_text_color(0, 0, 0)
         self.set_fill_color(245, 246, 248)
         self.set_draw_color(200, 200, 200)
-        self.multi_cell(0, 4, s(text), fill=True, border=1)
-        self.set_draw_color(0, 0, 0)
+        line_h = 4
+        text = s(text)
+        lines = text.removesuffix("\n").split("\n")
+        # Courier is monospaced, so the longest line is the widest. A line too
+        # wide for the box goes back through multi_cell, which wraps it.
+        if self.get_string_width(max(lines, key=len)) > self.CW - 2 * self.c_margin:
+            self.multi_cell(0, line_h, text, fill=True, border=1)
+            self.ln(2)
+            return
+        # Otherwise skip multi_cell's word-wrap pass and cell()'s layout work:
+        # one framed box per page, then each line placed on the baseline
+        # cell() would use.
+        x = self.M + self.c_margin
+        baseline = line_h / 2 + 0.3 * self.font_size
+        i = 0
+        while i < len(lines):
+            if self.will_page_break(line_h):
+                self.add_page()
+            n = min(int((self.h - self.y - self.b_margin) // line_h), len(lines) - i)
+            y = self.y
+            self.rect(self.M, y, self.CW, n * line_h, style="DF")
+            for line in lines[i:i + n]:
+                if line:
+                    self.text(x, y + baseline, line)
+                y += line_h
+            self.set_xy(self.M, y)
+            i += n
+        if text.endswith("\n"):
+            self.ln(line_h)     # trailing newline: blank line below the frame
         self.ln(2)
 
     def note(self, text):
-        self.set_font("Helvetica", "I", 9)
+        self.set_font(self.SANS, "I", 9)
+        self.set_text_color(0, 0, 0)
         self.set_fill_color(255, 251, 224)
         self.set_draw_color(210, 170, 0)
-        self.multi_cell(0, 5, s("  NOTE:  " + text), fill=True, border=1)
-        self.set_draw_color(0, 0, 0)
+        self.multi_cell(0, 5, _NOTE_PREFIX + s(text), fill=True, border=1)
         self.ln(2)
 
     def th(self, cols, widths):
-        self.set_font("Helvetica", "B", 9)
+        self.set_font(self.SANS, "B", 9)
+        self.set_text_color(0, 0, 0)
         self.set_fill_color(210, 225, 250)
+        self.set_draw_color(0, 0, 0)
         for col, w in zip(cols, widths):
             self.cell(w, 6, s(col), border=1, fill=True)
         self.ln()
+        # Row state for the tr() calls that follow: set once per table, not
+        # per row. The stripe colour is only used by cells with fill=True.
+        self.set_font(self.SANS, "", 9)
+        self.set_fill_color(248, 251, 255)
 
     def tr(self, cols, widths, shade=False):
-        self.set_font("Helvetica", "", 9)
-        if shade:
-            self.set_fill_color(248, 251, 255)
         for col, w in zip(cols, widths):
             self.cell(w, 6, s(str(col)), border=1, fill=shade)
         self.ln()
 
+    def _row3(self, a, b, c, wa, wb, wc, shade=False):
+        # Unrolled tr() for the common three-column table
+        self.cell(wa, 6, s(str(a)), border=1, fill=shade)
+        self.cell(wb, 6, s(str(b)), border=1, fill=shade)
+        self.cell(wc, 6, s(str(c)), border=1, fill=shade)
+        self.ln()
+
+    def data_table(self, cols, rows, widths):
+        """Header row plus zebra-striped body rows in one call."""
+        self.th(cols, widths)
+        stripes = cycle((True, False))
+        if len(widths) == 3:
+            wa, wb, wc = widths
+            for (a, b, c), shade in zip(rows, stripes):
+                self._row3(a, b, c, wa, wb, wc, shade=shade)
+        else:
+            for r, shade in zip(rows, stripes):
+                self.tr(r, widths, shade=shade)
+
+
+@lru_cache(maxsize=None)
+def guide_pdf_class() -> type:
+    """Return GuidePDF, importing fpdf2 on first use.
+
+    fpdf2 takes a few hundred ms to import, so --help and plain imports of
+    this module skip it; only building a PDF pays for it.
+    """
+    from fpdf import FPDF
+
+    class GuidePDF(GuideLayout, FPDF):
+        pass
+
+    return GuidePDF
+
+
+if TYPE_CHECKING:
+    class GuidePDF(GuideLayout, FPDF): ...
+
 
 # ---------------------------------------------------------------------------
 # Content builders
@@ -138,30 +267,26 @@ class GuidePDF(FPDF):
 
 def cover(pdf: GuidePDF):
     pdf.add_page()
-    pdf.set_fill_color(30, 80, 160)
-    pdf.rect(0, 45, 210, 60, "F")
-    # Reset position explicitly after rect() (it moves the cursor to x=0)
-    pdf.set_xy(pdf.M, 55)
-    pdf.set_text_color(255, 255, 255)
-    pdf.set_font("Helvetica", "B", 26)
-    pdf.multi_cell(pdf.CW, 13, "GIS Script Generator\nUser Guide", align="C")
-    pdf.set_x(pdf.M)
-    pdf.set_font("Helvetica", "", 12)
-    pdf.multi_cell(
-        pdf.CW, 7,
-        "PyQGIS  |  ArcPy  |  QGIS Project  |  ArcGIS Toolbox\n"
-        "Folium  |  Kepler.gl  |  pydeck  |  Web UI\n"
-        "Catalogue-driven script generation from PostGIS",
-        align="C",
-    )
+    # Title band, white on blue; the colours revert when the block ends
+    with pdf.local_context(fill_color=(30, 80, 160), text_color=(255, 255, 255)):
+        pdf.rect(0, 45, 210, 60, "F")
+        pdf.set_y(55)
+        pdf.set_font(pdf.SANS, "B", 26)
+        pdf.multi_cell(pdf.CW, 13, "GIS Script Generator\nUser Guide", align="C")
+        pdf.set_x(pdf.M)
+        pdf.set_font(pdf.SANS, "", 12)
+        pdf.multi_cell(
+            pdf.CW, 7,
+            "PyQGIS  |  ArcPy  |  QGIS Project  |  ArcGIS Toolbox\n"
+            "Folium  |  Kepler.gl  |  pydeck  |  Web UI\n"
+            "Catalogue-driven script generation from PostGIS",
+            align="C",
+        )
     pdf.set_y(120)
-    pdf.set_text_color(0, 0, 0)
-    pdf.set_font("Helvetica", "B", 11)
-    pdf.set_x(pdf.M)
-    pdf.cell(pdf.CW, 7, f"Version 0.1.0   |   {date.today()}", ln=1, align="C")
+    pdf.set_font(pdf.SANS, "B", 11)
+    pdf.cell(pdf.CW, 7, f"Version 0.1.0   |   {_TODAY}", ln=1, align="C")
     pdf.ln(10)
-    pdf.set_font("Helvetica", "", 10)
-    pdf.set_x(pdf.M)
+    pdf.set_font(pdf.SANS, "", 10)
     pdf.multi_cell(
         pdf.CW, 5,
         "This guide covers all eight template types generated by gis-codegen and\n"
@@ -185,7 +310,6 @@ def sec_overview(pdf: GuidePDF):
     )
 
     pdf.section("Template types")
-    pdf.th(["CLI command", "Template type", "Output file"], [72, 53, 45])
     rows = [
         ("gis-codegen --platform pyqgis",   "PyQGIS standalone script",      "*.py"),
         ("gis-codegen --platform arcpy",    "ArcPy / ArcGIS Pro script",     "*.py"),
@@ -198,8 +322,7 @@ def sec_overview(pdf: GuidePDF):
         ("gis-catalogue --platform pyqgis", "Catalogue PyQGIS (x N maps)",   "M##_name.py"),
         ("gis-catalogue --platform arcpy",  "Catalogue ArcPy  (x N maps)",   "M##_name.py"),
     ]
-    for i, r in enumerate(rows):
-        pdf.tr(r, [72, 53, 45], shade=(i % 2 == 0))
+    pdf.data_table(("CLI command", "Template type", "Output file"), rows, (72, 53, 45))
     pdf.ln(3)
 
     pdf.section("Package layout")
@@ -256,7 +379,6 @@ def sec_install(pdf: GuidePDF):
     )
 
     pdf.section("Optional environment variables")
-    pdf.th(["Variable", "Default", "Description"], [45, 40, 85])
     ev = [
         ("PGHOST",     "localhost",   "Database host"),
         ("PGPORT",     "5432",        "Database port"),
@@ -264,8 +386,7 @@ def sec_install(pdf: GuidePDF):
         ("PGUSER",     "postgres",    "Database user"),
         ("PGPASSWORD", "(required)",  "Database password -- no default"),
     ]
-    for i, r in enumerate(ev):
-        pdf.tr(r, [45, 40, 85], shade=(i % 2 == 0))
+    pdf.data_table(("Variable", "Default", "Description"), ev, (45, 40, 85))
     pdf.ln(3)
 
     pdf.section("Config file  (gis_codegen.toml)")
@@ -670,24 +791,20 @@ def sec_webui(pdf: GuidePDF):
     )
 
     pdf.section("Routes")
-    pdf.th(["Method", "Path", "Description"], [20, 35, 115])
     routes = [
         ("GET",  "/",          "Render the connection + platform form"),
         ("POST", "/generate",  "Connect, extract, generate, return file download"),
     ]
-    for i, r in enumerate(routes):
-        pdf.tr(r, [20, 35, 115], shade=(i % 2 == 0))
+    pdf.data_table(("Method", "Path", "Description"), routes, (20, 35, 115))
     pdf.ln(3)
 
     pdf.section("File download extensions")
-    pdf.th(["Platform", "Downloaded as"], [30, 140])
     exts = [
         ("qgs",                        "*.qgs  (QGIS project file)"),
         ("pyt",                        "*.pyt  (ArcGIS Python Toolbox)"),
         ("pyqgis, arcpy, folium, ...", "*.py   (Python script)"),
     ]
-    for i, r in enumerate(exts):
-        pdf.tr(r, [30, 140], shade=(i % 2 == 0))
+    pdf.data_table(("Platform", "Downloaded as"), exts, (30, 140))
     pdf.ln(3)
 
     pdf.section("Security notes")
@@ -768,7 +885,6 @@ def sec_webmaps(pdf: GuidePDF):
     )
 
     pdf.section("Colour palette (shared by Folium and pydeck)")
-    pdf.th(["Layer index", "Hex colour", "RGBA"], [35, 40, 95])
     colours = [
         ("0 (first)",  "#ff8c00", "[255, 140,   0, 160]  orange"),
         ("1",          "#0080ff", "[  0, 128, 255, 160]  blue"),
@@ -777,8 +893,7 @@ def sec_webmaps(pdf: GuidePDF):
         ("4",          "#b400ff", "[180,   0, 255, 160]  purple"),
         ("5+",         "#00c8c8", "[  0, 200, 200, 160]  teal (cycles)"),
     ]
-    for i, r in enumerate(colours):
-        pdf.tr(r, [35, 40, 95], shade=(i % 2 == 0))
+    pdf.data_table(("Layer index", "Hex colour", "RGBA"), colours, (35, 40, 95))
 
 
 def sec_ops(pdf: GuidePDF):
@@ -798,7 +913,6 @@ def sec_ops(pdf: GuidePDF):
     )
 
     pdf.section("General operations  (10)")
-    pdf.th(["--op value", "PyQGIS", "ArcPy"], [28, 72, 70])
     gen_ops = [
         ("reproject",    "processing: native:reprojectlayer",     "management.Project"),
         ("export",       "QgsVectorFileWriter -> GeoJSON",        "conversion.FeatureClassToShapefile"),
@@ -811,8 +925,7 @@ def sec_ops(pdf: GuidePDF):
         ("spatial_join", "joinattributesbylocation (commented)",  "analysis.SpatialJoin (commented)"),
         ("intersect",    "native:intersection (commented)",       "analysis.Intersect (commented)"),
     ]
-    for i, r in enumerate(gen_ops):
-        pdf.tr(r, [28, 72, 70], shade=(i % 2 == 0))
+    pdf.data_table(("--op value", "PyQGIS", "ArcPy"), gen_ops, (28, 72, 70))
     pdf.ln(3)
 
     pdf.body(
@@ -821,7 +934,6 @@ def sec_ops(pdf: GuidePDF):
     )
 
     pdf.section("3D massing operations  (5)")
-    pdf.th(["--op value", "Description", "Notes"], [28, 80, 62])
     ops_3d = [
         ("extrude",
          "Data-driven height extrusion renderer",
@@ -839,8 +951,7 @@ def sec_ops(pdf: GuidePDF):
          "Export 3D layer package",
          "PyQGIS: native:convert3dtiles\nArcPy: CreateSceneLayerPackage (.slpk)"),
     ]
-    for i, r in enumerate(ops_3d):
-        pdf.tr(r, [28, 80, 62], shade=(i % 2 == 0))
+    pdf.data_table(("--op value", "Description", "Notes"), ops_3d, (28, 80, 62))
 
 
 def sec_catalogue(pdf: GuidePDF):
@@ -853,7 +964,6 @@ def sec_catalogue(pdf: GuidePDF):
     )
 
     pdf.section("Inclusion rules")
-    pdf.th(["status", "spatial_layer_type", "Included?"], [30, 55, 85])
     rules = [
         ("have",    "Vector",        "YES"),
         ("partial", "Vector",        "YES"),
@@ -862,12 +972,10 @@ def sec_catalogue(pdf: GuidePDF):
         ("have",    "Raster",        "NO  -- skipped"),
         ("todo",    "Raster",        "NO  -- skipped"),
     ]
-    for i, r in enumerate(rules):
-        pdf.tr(r, [30, 55, 85], shade=(i % 2 == 0))
+    pdf.data_table(("status", "spatial_layer_type", "Included?"), rules, (30, 55, 85))
     pdf.ln(3)
 
     pdf.section("Key catalogue columns")
-    pdf.th(["Column", "Role in generated script"], [45, 125])
     cols = [
         ("map_id",            "Section header comment and layout name  (e.g. M07_layout)"),
         ("short_name",        "Python variable names and PostGIS table name (public.short_name)"),
@@ -877,8 +985,7 @@ def sec_catalogue(pdf: GuidePDF):
         ("deliverable_format","Written into the export stub comment"),
         ("classification",    "Passed to categorized renderer block as scheme comment"),
     ]
-    for i, r in enumerate(cols):
-        pdf.tr(r, [45, 125], shade=(i % 2 == 0))
+    pdf.data_table(("Column", "Role in generated script"), cols, (45, 125))
     pdf.ln(3)
 
     pdf.section("CLI usage")
@@ -917,10 +1024,6 @@ def sec_symbology(pdf: GuidePDF):
         "The first matching rule wins."
     )
 
-    pdf.th(
-        ["Keyword(s) in symbology_type", "PyQGIS renderer", "ArcPy renderer"],
-        [65, 58, 47]
-    )
     dispatch = [
         ("heatmap  OR  densit\xe9",
          "QgsHeatmapRenderer",
@@ -944,8 +1047,10 @@ def sec_symbology(pdf: GuidePDF):
          "# TODO: configure renderer",
          "# TODO: configure renderer"),
     ]
-    for i, r in enumerate(dispatch):
-        pdf.tr(r, [65, 58, 47], shade=(i % 2 == 0))
+    pdf.data_table(
+        ("Keyword(s) in symbology_type", "PyQGIS renderer", "ArcPy renderer"),
+        dispatch, (65, 58, 47),
+    )
     pdf.ln(3)
 
     pdf.note(
@@ -1217,7 +1322,6 @@ def sec_testing(pdf: GuidePDF):
     )
 
     pdf.section("Test suite summary")
-    pdf.th(["File", "Tests", "What is covered"], [52, 18, 100])
     suite = [
         ("test_generator.py", "173",
          "safe_var, pg_type_to_*, _qgs_geom_type, 15 op blocks x 2 platforms, "
@@ -1236,8 +1340,7 @@ def sec_testing(pdf: GuidePDF):
          "generate_pyqgis, generate_arcpy end-to-end (requires Docker)"),
         ("TOTAL",             "345", ""),
     ]
-    for i, r in enumerate(suite):
-        pdf.tr(r, [52, 18, 100], shade=(i % 2 == 0))
+    pdf.data_table(("File", "Tests", "What is covered"), suite, (52, 18, 100))
     pdf.ln(3)
 
     pdf.body(
@@ -1626,35 +1729,191 @@ def sec_architecture(pdf: GuidePDF):
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
-    pdf = GuidePDF("P", "mm", "A4")
+SECTIONS = (
+    sec_overview,           # Ch  1
+    sec_install,            # Ch  2
+    sec_configuration,      # Ch  3
+    sec_extraction,         # Ch  4
+    sec_pyqgis,             # Ch  5
+    sec_arcpy,              # Ch  6
+    sec_qgs,                # Ch  7
+    sec_pyt,                # Ch  8
+    sec_webui,              # Ch  9
+    sec_webmaps,            # Ch 10
+    sec_ops,                # Ch 11
+    sec_catalogue,          # Ch 12
+    sec_symbology,          # Ch 13
+    sec_cat_pyqgis,         # Ch 14
+    sec_cat_arcpy,          # Ch 15
+    sec_cli,                # Ch 16
+    sec_testing,            # Ch 17
+    sec_workflows,          # Ch 18
+    sec_troubleshooting,    # Ch 19
+    sec_architecture,       # Ch 20
+)
+
+
+def new_pdf(**kwargs) -> GuidePDF:
+    pdf = guide_pdf_class()("P", "mm", "A4", **kwargs)
     pdf.set_margins(20, 20, 20)
     pdf.set_auto_page_break(auto=True, margin=22)
+    return pdf
+
+
+def render_part(builder) -> bytes:
+    """Render the cover or one chapter as a standalone PDF (worker process)."""
+    if builder is cover:
+        pdf = new_pdf(number_pages=False)
+    else:
+        pdf = new_pdf(has_cover=False, number_pages=False)
+    builder(pdf)
+    return bytes(pdf.output())
+
+
+def page_number_stamps(n_pages: int) -> bytes:
+    """One page per guide page, carrying only the header page number."""
+    from fpdf import FPDF
+
+    pdf = FPDF("P", "mm", "A4")
+    pdf.set_auto_page_break(auto=False)
+    pdf.set_font(GuideLayout.SANS, "I", 8)
+    pdf.set_text_color(130, 130, 130)
+    for n in range(1, n_pages + 1):
+        pdf.add_page()
+        if n > 1:
+            # Same box as the page-number cell in GuideLayout.header()
+            pdf.set_xy(GuideLayout.M + GuideLayout.CW // 2, 20)
+            pdf.cell(GuideLayout.CW // 2, 7, f"Page {n}", align="R")
+    return bytes(pdf.output())
+
+
+def chapter_list(spec: str) -> tuple:
+    """argparse type for --chapters: "5", "5,7" or "1-4,12" -> section builders."""
+    picked = set()
+    for part in spec.split(","):
+        lo, _, hi = part.strip().partition("-")
+        try:
+            lo = int(lo)
+            hi = int(hi) if hi else lo
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"not a chapter number or range: {part!r}")
+        if not 1 <= lo <= hi <= len(SECTIONS):
+            raise argparse.ArgumentTypeError(f"chapters run from 1 to {len(SECTIONS)}: {part!r}")
+        picked.update(range(lo, hi + 1))
+    return tuple(SECTIONS[n - 1] for n in sorted(picked))
+
+
+def build_parallel(jobs: int, sections=SECTIONS, output: str = OUTPUT) -> int:
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        print("[ERROR] pypdf is required for --jobs: pip install pypdf", file=sys.stderr)
+        sys.exit(1)
+
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        parts = list(ex.map(render_part, (cover,) + sections))
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(io.BytesIO(part)))
+    stamps = PdfReader(io.BytesIO(page_number_stamps(len(writer.pages))))
+    for page, stamp in zip(writer.pages, stamps.pages):
+        page.merge_page(stamp)
+        page.compress_content_streams()
+    # Each part carries its own copy of the font dictionaries
+    writer.compress_identical_objects()  # dedupe and drop orphans (both default on)
+    writer.write(output)
+    return len(writer.pages)
+
+
+def pack_object_streams(path: str) -> None:
+    """Rewrite the PDF in place with its objects packed into object streams.
+
+    fpdf2 and pypdf write every dictionary (pages, fonts, resources) as a
+    plain top-level object; qpdf gathers them into zlib-compressed object
+    streams in one pass. Page content streams are already compressed.
+    """
+    try:
+        import pikepdf
+    except ImportError:
+        print("[ERROR] pikepdf is required for --object-streams: pip install pikepdf", file=sys.stderr)
+        sys.exit(1)
+
+    with pikepdf.open(path, allow_overwriting_input=True) as pdf:
+        pdf.save(path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+
+
+# ---------------------------------------------------------------------------
+# Output cache: skip the build when nothing that shapes the PDF has changed.
+# The digest of the last build is kept in <output>.stamp (see build_stamp.py);
+# unlike the map scripts it hashes the source and options, not input mtimes
+# ---------------------------------------------------------------------------
+
+
+def build_digest(args) -> str:
+    h = hashlib.blake2b(CACHE_VERSION.encode(), digest_size=16)
+    with open(__file__, "rb") as f:
+        h.update(f.read())
+    try:
+        fpdf_version = metadata.version("fpdf2")
+    except metadata.PackageNotFoundError:
+        fpdf_version = "unknown"
+    # The cover and footer carry today's date, so the cache lasts a day at most
+    chapters = ",".join(sec.__name__ for sec in args.chapters)
+    h.update(f"|{_TODAY}|{fpdf_version}|{args.jobs > 1}|{chapters}|{args.object_streams}".encode())
+    return h.hexdigest()
+
 
+def build_serial(sections=SECTIONS, output: str = OUTPUT) -> int:
+    pdf = new_pdf()
     cover(pdf)
-    sec_overview(pdf)           # Ch  1
-    sec_install(pdf)            # Ch  2
-    sec_configuration(pdf)      # Ch  3
-    sec_extraction(pdf)         # Ch  4
-    sec_pyqgis(pdf)             # Ch  5
-    sec_arcpy(pdf)              # Ch  6
-    sec_qgs(pdf)                # Ch  7
-    sec_pyt(pdf)                # Ch  8
-    sec_webui(pdf)              # Ch  9
-    sec_webmaps(pdf)            # Ch 10
-    sec_ops(pdf)                # Ch 11
-    sec_catalogue(pdf)          # Ch 12
-    sec_symbology(pdf)          # Ch 13
-    sec_cat_pyqgis(pdf)         # Ch 14
-    sec_cat_arcpy(pdf)          # Ch 15
-    sec_cli(pdf)                # Ch 16
-    sec_testing(pdf)            # Ch 17
-    sec_workflows(pdf)          # Ch 18
-    sec_troubleshooting(pdf)    # Ch 19
-    sec_architecture(pdf)       # Ch 20
-
-    pdf.output(OUTPUT)
-    print(f"[OK] {OUTPUT}  ({pdf.page} pages)")
+    for sec in sections:
+        sec(pdf)
+    pdf.output(output)
+    return pdf.page
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the GIS Script Generator user-guide PDF.")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Render chapters in N worker processes and merge with pypdf (default: 1, single process)",
+    )
+    parser.add_argument(
+        "--chapters", type=chapter_list, default=SECTIONS, metavar="LIST",
+        help="Only render these chapters after the cover, e.g. 5 or 1-4,12 (default: all)",
+    )
+    parser.add_argument(
+        "--object-streams", action="store_true",
+        help="Repack the output into compressed object streams with pikepdf (smaller file)",
+    )
+    parser.add_argument(
+        "-o", "--output", metavar="PATH",
+        help=f"Output file (default: {OUTPUT}, or {DRAFT_OUTPUT} with --chapters)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Rebuild even if the existing PDF is up to date",
+    )
+    args = parser.parse_args(argv)
+
+    output = args.output
+    if output is None:
+        output = OUTPUT if args.chapters == SECTIONS else DRAFT_OUTPUT
+
+    digest = build_digest(args)
+    if not args.force and is_up_to_date(output, digest):
+        print(f"[OK] {output}  (up to date, nothing changed)")
+        return
+
+    if args.jobs > 1:
+        pages = build_parallel(args.jobs, args.chapters, output)
+    else:
+        pages = build_serial(args.chapters, output)
+    if args.object_streams:
+        pack_object_streams(output)
+    write_stamp(output, digest)
+    print(f"[OK] {output}  ({pages} pages)")
 
 
 if __name__ == "__main__":